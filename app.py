@@ -1,14 +1,34 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, g, Response, stream_template, stream_with_context
 import mysql.connector
 from werkzeug.security import generate_password_hash, check_password_hash
 import os
+import re
+import atexit
 from urllib.parse import quote
 from flask_mail import Mail, Message
 from dotenv import load_dotenv
+import jinja2
 import datetime
+import hmac
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from contextlib import contextmanager
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import difflib
+import orjson
+from rapidfuzz import process, fuzz
+from rapidfuzz.distance import Levenshtein
+import pybktree
+from cachetools import TTLCache
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
+import openai
+from google.cloud import translate_v2 as translate
+import base64
+import tempfile
 
 # Load environment variables
 load_dotenv()
@@ -26,23 +46,152 @@ app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER')
 
 mail = Mail(app)
 
+# Server-side sessions (optional). The default signed-cookie store
+# re-signs the cookie on every response and re-verifies it on every
+# request; setting SESSION_TYPE=memcached moves session state to an
+# O(1) cache lookup and shrinks the Set-Cookie traffic to just an id.
+if os.getenv('SESSION_TYPE') == 'memcached':
+    import pylibmc
+    from flask_session import Session
+
+    app.config['SESSION_TYPE'] = 'memcached'
+    app.config['SESSION_MEMCACHED'] = pylibmc.Client(
+        os.getenv('MEMCACHED_SERVERS', '127.0.0.1:11211').split(','))
+    app.config['PERMANENT_SESSION_LIFETIME'] = int(os.getenv('SESSION_TTL', 86400))
+    Session(app)
+
 # Database configuration
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
     'user': os.getenv('DB_USER', 'root'),
     'password': os.getenv('DB_PASSWORD', '69688986'),
-    'database': os.getenv('DB_NAME', 'medassist_db')
+    'database': os.getenv('DB_NAME', 'medassist_db'),
+    # Prefer the C extension so MySQL protocol decoding is native code
+    # rather than pure-Python row parsing. Its sockets can't be greened
+    # by gevent's monkey-patching, so set DB_USE_PURE=true when running
+    # gevent workers (see README) or every DB call blocks the event loop
+    'use_pure': os.getenv('DB_USE_PURE', 'False').lower() == 'true'
 }
 
+# Connection pool - created lazily so the app can still import when MySQL is down
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+_cnx_pool = None
+
+def _get_pool():
+    """Create the connection pool on first use and reuse it afterwards."""
+    global _cnx_pool
+    if _cnx_pool is None:
+        _cnx_pool = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name='medassist',
+            pool_size=DB_POOL_SIZE,
+            pool_reset_session=True,
+            **DB_CONFIG
+        )
+    return _cnx_pool
+
+# Password hashing - argon2 tuned for ~50ms verification instead of
+# werkzeug's pbkdf2 default (600k iterations of pure CPU per login)
+PH = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Optional cache of successful verifications so repeated logins with the
+# same credentials skip the argon2 work. Keyed by an HMAC of the password
+# so the plaintext never enters the cache. Off by default.
+AUTH_CACHE_ENABLED = os.getenv('AUTH_CACHE_ENABLED', 'False').lower() == 'true'
+_AUTH_CACHE_MAX = 4096
+_auth_cache = {}
+
+# Computed once at import; login verifies against this when the
+# username doesn't exist so both failure paths cost one hash check and
+# response timing doesn't leak which usernames are registered
+_DUMMY_HASH = PH.hash('timing-defense-only')
+
+def hash_password(password):
+    """Hash a password with argon2 for storage."""
+    return PH.hash(password)
+
+def verify_password(stored_hash, password):
+    """Verify a password against a stored hash.
+
+    Falls back to werkzeug's check_password_hash for accounts created
+    before the switch to argon2.
+    """
+    if AUTH_CACHE_ENABLED:
+        mac = hmac.new(app.secret_key.encode(), password.encode(), 'sha256').hexdigest()
+        if _auth_cache.get((stored_hash, mac)):
+            return True
+
+    if stored_hash.startswith('$argon2'):
+        try:
+            PH.verify(stored_hash, password)
+            valid = True
+        except VerifyMismatchError:
+            valid = False
+    else:
+        valid = check_password_hash(stored_hash, password)
+
+    if AUTH_CACHE_ENABLED and valid:
+        if len(_auth_cache) >= _AUTH_CACHE_MAX:
+            _auth_cache.pop(next(iter(_auth_cache)))
+        _auth_cache[(stored_hash, mac)] = True
+
+    return valid
+
 def get_db_connection():
-    """Create and return a database connection."""
+    """Check out a database connection from the pool.
+
+    Calling .close() on the returned connection hands it back to the
+    pool instead of tearing down the TCP session.
+    """
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        return connection
+        return _get_pool().get_connection()
     except mysql.connector.Error as err:
         print(f"Error connecting to MySQL: {err}")
         return None
 
+def get_request_db():
+    """Get a pooled connection scoped to the current request.
+
+    Checked out lazily on first use and returned to the pool on request
+    teardown, so all queries in one request share a single checkout.
+    """
+    if 'db' not in g:
+        g.db = get_db_connection()
+    return g.db
+
+@app.teardown_request
+def _release_request_db(exception=None):
+    db = g.pop('db', None)
+    if db is not None:
+        db.close()
+
+@app.context_processor
+def inject_user():
+    # Resolve the username once per render instead of passing it through
+    # every render_template call; templates keep referencing {{ username }}
+    return {'username': session.get('username', 'User') if 'user_id' in session else None}
+
+@contextmanager
+def db_cursor():
+    """Check out a pooled connection and cursor, guaranteeing release.
+
+    Yields (connection, cursor), or (None, None) when no connection is
+    available. Both are closed on exit - the connection going back to
+    the pool - even when the body raises.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        yield None, None
+        return
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        yield connection, cursor
+    finally:
+        if cursor is not None:
+            cursor.close()
+        connection.close()
+
 def init_database():
     """Initialize the database and create tables if they don't exist."""
     try:
@@ -70,11 +219,10 @@ def init_database():
                 username VARCHAR(100) NOT NULL,
                 email VARCHAR(100) UNIQUE NOT NULL,
                 password VARCHAR(255) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE KEY uk_username (username)
             )
             """
-            cursor.execute(create_users_table)
-            
             # Create appointments table
             create_appointments_table = """
             CREATE TABLE IF NOT EXISTS appointments (
@@ -95,8 +243,6 @@ def init_database():
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
             """
-            cursor.execute(create_appointments_table)
-            
             # Medical Records table
             create_medical_records_table = """
             CREATE TABLE IF NOT EXISTS medical_records (
@@ -113,8 +259,6 @@ def init_database():
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
             """
-            cursor.execute(create_medical_records_table)
-            
             # Medications table
             create_medications_table = """
             CREATE TABLE IF NOT EXISTS medications (
@@ -133,8 +277,6 @@ def init_database():
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
             """
-            cursor.execute(create_medications_table)
-            
             # Vital Signs table
             create_vital_signs_table = """
             CREATE TABLE IF NOT EXISTS vital_signs (
@@ -152,8 +294,6 @@ def init_database():
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
             """
-            cursor.execute(create_vital_signs_table)
-            
             # Lab Results table
             create_lab_results_table = """
             CREATE TABLE IF NOT EXISTS lab_results (
@@ -169,8 +309,6 @@ def init_database():
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
             """
-            cursor.execute(create_lab_results_table)
-            
             # Emergency Contacts table
             create_emergency_contacts_table = """
             CREATE TABLE IF NOT EXISTS emergency_contacts (
@@ -185,8 +323,6 @@ def init_database():
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
             """
-            cursor.execute(create_emergency_contacts_table)
-            
             # Drug Info Cache table for local drug database
             create_drug_info_table = """
             CREATE TABLE IF NOT EXISTS drug_info_cache (
@@ -201,8 +337,44 @@ def init_database():
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
             )
             """
-            cursor.execute(create_drug_info_table)
-            
+            # Send all DDL in one round-trip instead of eight
+            all_ddl = ";".join((
+                create_users_table,
+                create_appointments_table,
+                create_medical_records_table,
+                create_medications_table,
+                create_vital_signs_table,
+                create_lab_results_table,
+                create_emergency_contacts_table,
+                create_drug_info_table
+            ))
+            for _ in cursor.execute(all_ddl, multi=True):
+                pass
+
+            # Databases created before the unique username constraint
+            # won't pick it up from CREATE TABLE IF NOT EXISTS, and
+            # signup's duplicate handling relies on errno 1062 from this
+            # index - so add it idempotently here
+            try:
+                cursor.execute("ALTER TABLE users ADD UNIQUE KEY uk_username (username)")
+            except mysql.connector.Error as err:
+                if err.errno != 1061:
+                    raise
+
+            # Composite indexes so the user-scoped list pages are index
+            # range scans instead of per-request filesorts
+            # (errno 1061 = index already exists)
+            for index_ddl in (
+                "CREATE INDEX idx_mr_user_date ON medical_records (user_id, date_recorded DESC)",
+                "CREATE INDEX idx_meds_user_active_start ON medications (user_id, is_active, start_date DESC)",
+                "CREATE INDEX idx_vs_user_date ON vital_signs (user_id, measurement_date DESC)"
+            ):
+                try:
+                    cursor.execute(index_ddl)
+                except mysql.connector.Error as err:
+                    if err.errno != 1061:
+                        raise
+
             connection.commit()
             cursor.close()
             connection.close()
@@ -211,6 +383,161 @@ def init_database():
     except mysql.connector.Error as err:
         print(f"Error initializing database: {err}")
 
+# Email templates - compiled once at import so each send is a cheap
+# substitution instead of re-building multi-KB f-strings
+WELCOME_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: 'Segoe UI', sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #3B38A0, #4ECDC4); padding: 30px; text-align: center; color: white; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .logo { font-size: 2rem; font-weight: bold; margin-bottom: 10px; }
+        .btn { background: #3B38A0; color: white; padding: 12px 24px; text-decoration: none; border-radius: 25px; display: inline-block; margin: 20px 0; }
+        .features { background: white; padding: 20px; border-radius: 8px; margin: 20px 0; }
+        .feature { margin: 10px 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <div class="logo">MedAssist</div>
+            <h1>Welcome to Your Health Journey!</h1>
+        </div>
+        <div class="content">
+            <h2>Hello {{ username }}!</h2>
+            <p>Thank you for joining MedAssist - your AI-powered health companion.</p>
+            
+            <div class="features">
+                <h3>What you can do with MedAssist:</h3>
+                <div class="feature"><strong>AI Health Assistant</strong> - Get personalized health recommendations</div>
+                <div class="feature"><strong>Appointment Booking</strong> - Schedule medical appointments easily</div>
+                <div class="feature"><strong>Health Records</strong> - Manage your complete medical history</div>
+                <div class="feature"><strong>Medication Tracking</strong> - Track prescriptions and reminders</div>
+                <div class="feature"><strong>Drug Information Chat</strong> - Ask about any medication instantly</div>
+            </div>
+            
+            <p>Ready to get started?</p>
+            <a href="http://localhost:5000/dashboard" class="btn">Go to Dashboard</a>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+APPOINTMENT_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: 'Segoe UI', sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #3B38A0, #4ECDC4); padding: 30px; text-align: center; color: white; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .appointment-details { background: white; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #4ECDC4; }
+        .detail-row { display: flex; justify-content: space-between; margin: 10px 0; }
+        .label { font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>MedAssist</h1>
+            <h2>Appointment Confirmed!</h2>
+        </div>
+        <div class="content">
+            <p>Dear {{ patient_name }},</p>
+            <p>Your appointment has been successfully booked.</p>
+            
+            <div class="appointment-details">
+                <div class="detail-row">
+                    <span class="label">Patient Name:</span>
+                    <span>{{ patient_name }}</span>
+                </div>
+                <div class="detail-row">
+                    <span class="label">Doctor:</span>
+                    <span>{{ doctor }}</span>
+                </div>
+                <div class="detail-row">
+                    <span class="label">Date:</span>
+                    <span>{{ appointment_date }}</span>
+                </div>
+                <div class="detail-row">
+                    <span class="label">Time:</span>
+                    <span>{{ appointment_time }}</span>
+                </div>
+            </div>
+            
+            <p>Thank you for choosing MedAssist!</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+def _minify_html(html):
+    """Strip indentation and inter-tag whitespace from an HTML template."""
+    html = re.sub(r'>\s+<', '><', html)
+    return re.sub(r'\s+', ' ', html).strip()
+
+# Minified + compiled exactly once at import; each send renders the
+# compact form, cutting bytes over SMTP
+_WELCOME_TMPL = jinja2.Template(_minify_html(WELCOME_HTML))
+_APPOINTMENT_TMPL = jinja2.Template(_minify_html(APPOINTMENT_HTML))
+
+# Persistent SMTP connection per thread so a burst of emails shares one
+# TLS handshake + AUTH instead of reconnecting per send. Connections
+# live until the process exits (each pooled send runs in its own app
+# context, so closing on context teardown would defeat the reuse);
+# every open connection is also tracked so shutdown can close them all.
+_SMTP_LOCAL = threading.local()
+_SMTP_CONNS = []
+_SMTP_CONNS_LOCK = threading.Lock()
+
+def _get_smtp():
+    """Return this thread's open SMTP connection, reconnecting if dropped."""
+    conn = getattr(_SMTP_LOCAL, 'conn', None)
+    if conn is None or getattr(conn.host, 'sock', None) is None:
+        conn = mail.connect()
+        conn.__enter__()
+        _SMTP_LOCAL.conn = conn
+        with _SMTP_CONNS_LOCK:
+            _SMTP_CONNS.append(conn)
+    return conn
+
+# Email delivery runs on a small worker pool so HTTP responses don't
+# wait on the SMTP dialogue
+MAIL_POOL = ThreadPoolExecutor(max_workers=4)
+
+@atexit.register
+def _shutdown_mail():
+    """Drain queued sends, then QUIT the per-thread SMTP connections."""
+    MAIL_POOL.shutdown(wait=True)
+    with _SMTP_CONNS_LOCK:
+        conns = _SMTP_CONNS[:]
+        del _SMTP_CONNS[:]
+    for conn in conns:
+        try:
+            conn.__exit__(None, None, None)
+        except Exception:
+            pass
+
+def send_welcome_email_async(username, email):
+    """Queue the welcome email for background delivery."""
+    def _task():
+        with app.app_context():
+            send_welcome_email(username, email)
+    MAIL_POOL.submit(_task)
+
+def send_appointment_confirmation_async(appointment_data):
+    """Queue the appointment confirmation for background delivery."""
+    def _task():
+        with app.app_context():
+            send_appointment_confirmation(appointment_data)
+    MAIL_POOL.submit(_task)
+
 def send_welcome_email(username, email):
     """Send welcome email to new user."""
     try:
@@ -219,49 +546,9 @@ def send_welcome_email(username, email):
             recipients=[email]
         )
         
-        msg.html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: 'Segoe UI', sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #3B38A0, #4ECDC4); padding: 30px; text-align: center; color: white; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .logo {{ font-size: 2rem; font-weight: bold; margin-bottom: 10px; }}
-                .btn {{ background: #3B38A0; color: white; padding: 12px 24px; text-decoration: none; border-radius: 25px; display: inline-block; margin: 20px 0; }}
-                .features {{ background: white; padding: 20px; border-radius: 8px; margin: 20px 0; }}
-                .feature {{ margin: 10px 0; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <div class="logo">MedAssist</div>
-                    <h1>Welcome to Your Health Journey!</h1>
-                </div>
-                <div class="content">
-                    <h2>Hello {username}!</h2>
-                    <p>Thank you for joining MedAssist - your AI-powered health companion.</p>
-                    
-                    <div class="features">
-                        <h3>What you can do with MedAssist:</h3>
-                        <div class="feature"><strong>AI Health Assistant</strong> - Get personalized health recommendations</div>
-                        <div class="feature"><strong>Appointment Booking</strong> - Schedule medical appointments easily</div>
-                        <div class="feature"><strong>Health Records</strong> - Manage your complete medical history</div>
-                        <div class="feature"><strong>Medication Tracking</strong> - Track prescriptions and reminders</div>
-                        <div class="feature"><strong>Drug Information Chat</strong> - Ask about any medication instantly</div>
-                    </div>
-                    
-                    <p>Ready to get started?</p>
-                    <a href="http://localhost:5000/dashboard" class="btn">Go to Dashboard</a>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        msg.html = _WELCOME_TMPL.render(username=username)
         
-        mail.send(msg)
+        _get_smtp().send(msg)
         print(f"Welcome email sent to {email}")
         return True
     except Exception as e:
@@ -276,57 +563,9 @@ def send_appointment_confirmation(appointment_data):
             recipients=[appointment_data['patient_email']]
         )
         
-        msg.html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: 'Segoe UI', sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #3B38A0, #4ECDC4); padding: 30px; text-align: center; color: white; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .appointment-details {{ background: white; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #4ECDC4; }}
-                .detail-row {{ display: flex; justify-content: space-between; margin: 10px 0; }}
-                .label {{ font-weight: bold; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>MedAssist</h1>
-                    <h2>Appointment Confirmed!</h2>
-                </div>
-                <div class="content">
-                    <p>Dear {appointment_data['patient_name']},</p>
-                    <p>Your appointment has been successfully booked.</p>
-                    
-                    <div class="appointment-details">
-                        <div class="detail-row">
-                            <span class="label">Patient Name:</span>
-                            <span>{appointment_data['patient_name']}</span>
-                        </div>
-                        <div class="detail-row">
-                            <span class="label">Doctor:</span>
-                            <span>{appointment_data['doctor']}</span>
-                        </div>
-                        <div class="detail-row">
-                            <span class="label">Date:</span>
-                            <span>{appointment_data['appointment_date']}</span>
-                        </div>
-                        <div class="detail-row">
-                            <span class="label">Time:</span>
-                            <span>{appointment_data['appointment_time']}</span>
-                        </div>
-                    </div>
-                    
-                    <p>Thank you for choosing MedAssist!</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        msg.html = _APPOINTMENT_TMPL.render(**appointment_data)
         
-        mail.send(msg)
+        _get_smtp().send(msg)
         print(f"Appointment confirmation sent to {appointment_data['patient_email']}")
         return True
     except Exception as e:
@@ -334,218 +573,390 @@ def send_appointment_confirmation(appointment_data):
         return False
 
 # Enhanced Drug Information Functions
-def get_local_drug_info_with_fuzzy_search(drug_name):
-    """Get drug information with fuzzy matching for common misspellings."""
-    
-    # Enhanced local drug database including cytarabine
-    local_drugs = {
-        'paracetamol': {
-            'generic_name': 'Acetaminophen (Paracetamol)',
-            'brand_name': 'Tylenol, Panadol, Calpol',
-            'manufacturer': 'Various',
-            'indications': 'Used to treat pain and reduce fever. Commonly used for headaches, muscle aches, arthritis, backaches, toothaches, colds, and fevers.',
-            'dosage': 'Adults: 325-650 mg every 4-6 hours or 1000 mg every 6-8 hours. Maximum 4000 mg per day.',
-            'warnings': 'Do not exceed recommended dose. Overdose can cause serious liver damage that may be fatal.',
-            'side_effects': 'Generally well tolerated when used as directed. Rare side effects may include nausea, stomach pain, loss of appetite.'
-        },
-        'acetaminophen': {
-            'generic_name': 'Acetaminophen',
-            'brand_name': 'Tylenol, Panadol, Calpol',
-            'manufacturer': 'Various',
-            'indications': 'Used to treat pain and reduce fever. Commonly used for headaches, muscle aches, arthritis, backaches, toothaches, colds, and fevers.',
-            'dosage': 'Adults: 325-650 mg every 4-6 hours or 1000 mg every 6-8 hours. Maximum 4000 mg per day.',
-            'warnings': 'Do not exceed recommended dose. Overdose can cause serious liver damage.',
-            'side_effects': 'Generally well tolerated. May cause nausea, stomach pain, loss of appetite, or rash in rare cases.'
-        },
-        'ibuprofen': {
-            'generic_name': 'Ibuprofen',
-            'brand_name': 'Advil, Motrin, Nurofen',
-            'manufacturer': 'Various',
-            'indications': 'NSAID used to reduce fever and treat pain or inflammation caused by conditions such as headache, toothache, back pain, arthritis.',
-            'dosage': 'Adults: 200-400 mg every 4-6 hours as needed. Maximum 1200 mg per day for OTC use.',
-            'warnings': 'May increase risk of heart attack or stroke. Can cause stomach bleeding and ulcers.',
-            'side_effects': 'Common: Stomach upset, heartburn, nausea, vomiting, headache, diarrhea, constipation, dizziness.'
-        },
-        'aspirin': {
-            'generic_name': 'Aspirin (Acetylsalicylic Acid)',
-            'brand_name': 'Bayer, Bufferin, Ecotrin',
-            'manufacturer': 'Various',
-            'indications': 'Used to reduce fever and relieve mild to moderate pain. Also used in low doses to prevent heart attacks and strokes.',
-            'dosage': 'Adults: 325-650 mg every 4 hours for pain/fever. For cardiovascular protection: 81 mg daily.',
-            'warnings': 'Can cause stomach bleeding and ulcers. Do not give to children under 16 due to risk of Reye\'s syndrome.',
-            'side_effects': 'Common: Stomach irritation, heartburn, drowsiness, headache, mild nausea.'
-        },
-        'metformin': {
-            'generic_name': 'Metformin',
-            'brand_name': 'Glucophage, Fortamet, Glumetza',
-            'manufacturer': 'Various',
-            'indications': 'Used to treat type 2 diabetes mellitus. Helps control blood sugar levels by decreasing glucose production in the liver.',
-            'dosage': 'Adults: Usually start with 500 mg twice daily or 850 mg once daily with meals. May gradually increase to maximum 2000-2550 mg daily.',
-            'warnings': 'May cause lactic acidosis (rare but serious). Avoid excessive alcohol consumption. Monitor kidney function regularly.',
-            'side_effects': 'Common: Diarrhea, nausea, vomiting, gas, weakness, indigestion, abdominal discomfort, headache, metallic taste.'
-        },
-        'lisinopril': {
-            'generic_name': 'Lisinopril',
-            'brand_name': 'Prinivil, Zestril',
-            'manufacturer': 'Various',
-            'indications': 'ACE inhibitor used to treat high blood pressure (hypertension), heart failure, and to improve survival after heart attacks.',
-            'dosage': 'Adults: Usually start with 10 mg once daily. May increase to 20-40 mg daily based on response.',
-            'warnings': 'Can cause severe drop in blood pressure. May cause birth defects - do not use during pregnancy.',
-            'side_effects': 'Common: Dry persistent cough, dizziness, headache, fatigue, nausea, low blood pressure.'
-        },
-        'amoxicillin': {
-            'generic_name': 'Amoxicillin',
-            'brand_name': 'Amoxil, Trimox',
-            'manufacturer': 'Various',
-            'indications': 'Penicillin antibiotic used to treat various bacterial infections including respiratory tract infections, urinary tract infections, skin infections.',
-            'dosage': 'Adults: 250-500 mg every 8 hours or 500-875 mg every 12 hours. Complete full course even if feeling better.',
-            'warnings': 'Do not use if allergic to penicillin. May reduce effectiveness of birth control pills.',
-            'side_effects': 'Common: Nausea, vomiting, diarrhea, stomach pain, headache, dizziness.'
-        },
-        'omeprazole': {
-            'generic_name': 'Omeprazole',
-            'brand_name': 'Prilosec, Losec',
-            'manufacturer': 'Various',
-            'indications': 'Proton pump inhibitor used to treat GERD, stomach ulcers, duodenal ulcers. Reduces stomach acid production.',
-            'dosage': 'Adults: 20-40 mg once daily before breakfast. Take 30-60 minutes before eating.',
-            'warnings': 'Long-term use may increase risk of bone fractures, vitamin B12 deficiency, and kidney problems.',
-            'side_effects': 'Common: Headache, diarrhea, nausea, vomiting, stomach pain, gas, dizziness.'
-        },
-        'cytarabine': {
-            'generic_name': 'Cytarabine',
-            'brand_name': 'Cytosar-U, Tarabine PFS, Ara-C',
-            'manufacturer': 'Various',
-            'indications': 'Antineoplastic agent used to treat acute lymphocytic leukemia, acute myelogenous leukemia, chronic myelogenous leukemia, and certain lymphomas. Works by interfering with DNA synthesis in cancer cells.',
-            'dosage': 'Dosage varies greatly depending on the specific condition being treated, patient factors, and treatment protocol. Typically given as intravenous infusion. Common regimens range from 100-200 mg/m² daily for 5-10 days. Must be administered by qualified healthcare professionals only.',
-            'warnings': 'Severe myelosuppression (bone marrow suppression), cytarabine syndrome, neurotoxicity at high doses, hepatotoxicity. Requires close monitoring of blood counts, liver function, and neurological status. Only for use under strict medical supervision in specialized cancer treatment facilities.',
-            'side_effects': 'Common: Severe nausea and vomiting, diarrhea, mouth sores, fever, bone marrow suppression leading to increased infection risk, bleeding, and anemia. Serious: Liver toxicity, lung problems, neurological effects (especially at high doses), severe infections due to immunosuppression.'
-        }
-    }
-    
-    # Common misspellings and alternative names
-    drug_aliases = {
-        'paracitamol': 'paracetamol',
-        'paracitemol': 'paracetamol',
-        'tylenol': 'acetaminophen',
-        'panadol': 'paracetamol',
-        'advil': 'ibuprofen',
-        'motrin': 'ibuprofen',
-        'glucophage': 'metformin',
-        'prinivil': 'lisinopril',
-        'zestril': 'lisinopril',
-        'cytosar': 'cytarabine',
-        'ara-c': 'cytarabine',
-        'cytosar-u': 'cytarabine',
-        'tarabine': 'cytarabine'
+
+# Local drug database including cytarabine - built once at import so
+# lookups are a dict probe instead of rebuilding these tables per request
+LOCAL_DRUGS = {
+    'paracetamol': {
+        'generic_name': 'Acetaminophen (Paracetamol)',
+        'brand_name': 'Tylenol, Panadol, Calpol',
+        'manufacturer': 'Various',
+        'indications': 'Used to treat pain and reduce fever. Commonly used for headaches, muscle aches, arthritis, backaches, toothaches, colds, and fevers.',
+        'dosage': 'Adults: 325-650 mg every 4-6 hours or 1000 mg every 6-8 hours. Maximum 4000 mg per day.',
+        'warnings': 'Do not exceed recommended dose. Overdose can cause serious liver damage that may be fatal.',
+        'side_effects': 'Generally well tolerated when used as directed. Rare side effects may include nausea, stomach pain, loss of appetite.'
+    },
+    'acetaminophen': {
+        'generic_name': 'Acetaminophen',
+        'brand_name': 'Tylenol, Panadol, Calpol',
+        'manufacturer': 'Various',
+        'indications': 'Used to treat pain and reduce fever. Commonly used for headaches, muscle aches, arthritis, backaches, toothaches, colds, and fevers.',
+        'dosage': 'Adults: 325-650 mg every 4-6 hours or 1000 mg every 6-8 hours. Maximum 4000 mg per day.',
+        'warnings': 'Do not exceed recommended dose. Overdose can cause serious liver damage.',
+        'side_effects': 'Generally well tolerated. May cause nausea, stomach pain, loss of appetite, or rash in rare cases.'
+    },
+    'ibuprofen': {
+        'generic_name': 'Ibuprofen',
+        'brand_name': 'Advil, Motrin, Nurofen',
+        'manufacturer': 'Various',
+        'indications': 'NSAID used to reduce fever and treat pain or inflammation caused by conditions such as headache, toothache, back pain, arthritis.',
+        'dosage': 'Adults: 200-400 mg every 4-6 hours as needed. Maximum 1200 mg per day for OTC use.',
+        'warnings': 'May increase risk of heart attack or stroke. Can cause stomach bleeding and ulcers.',
+        'side_effects': 'Common: Stomach upset, heartburn, nausea, vomiting, headache, diarrhea, constipation, dizziness.'
+    },
+    'aspirin': {
+        'generic_name': 'Aspirin (Acetylsalicylic Acid)',
+        'brand_name': 'Bayer, Bufferin, Ecotrin',
+        'manufacturer': 'Various',
+        'indications': 'Used to reduce fever and relieve mild to moderate pain. Also used in low doses to prevent heart attacks and strokes.',
+        'dosage': 'Adults: 325-650 mg every 4 hours for pain/fever. For cardiovascular protection: 81 mg daily.',
+        'warnings': 'Can cause stomach bleeding and ulcers. Do not give to children under 16 due to risk of Reye\'s syndrome.',
+        'side_effects': 'Common: Stomach irritation, heartburn, drowsiness, headache, mild nausea.'
+    },
+    'metformin': {
+        'generic_name': 'Metformin',
+        'brand_name': 'Glucophage, Fortamet, Glumetza',
+        'manufacturer': 'Various',
+        'indications': 'Used to treat type 2 diabetes mellitus. Helps control blood sugar levels by decreasing glucose production in the liver.',
+        'dosage': 'Adults: Usually start with 500 mg twice daily or 850 mg once daily with meals. May gradually increase to maximum 2000-2550 mg daily.',
+        'warnings': 'May cause lactic acidosis (rare but serious). Avoid excessive alcohol consumption. Monitor kidney function regularly.',
+        'side_effects': 'Common: Diarrhea, nausea, vomiting, gas, weakness, indigestion, abdominal discomfort, headache, metallic taste.'
+    },
+    'lisinopril': {
+        'generic_name': 'Lisinopril',
+        'brand_name': 'Prinivil, Zestril',
+        'manufacturer': 'Various',
+        'indications': 'ACE inhibitor used to treat high blood pressure (hypertension), heart failure, and to improve survival after heart attacks.',
+        'dosage': 'Adults: Usually start with 10 mg once daily. May increase to 20-40 mg daily based on response.',
+        'warnings': 'Can cause severe drop in blood pressure. May cause birth defects - do not use during pregnancy.',
+        'side_effects': 'Common: Dry persistent cough, dizziness, headache, fatigue, nausea, low blood pressure.'
+    },
+    'amoxicillin': {
+        'generic_name': 'Amoxicillin',
+        'brand_name': 'Amoxil, Trimox',
+        'manufacturer': 'Various',
+        'indications': 'Penicillin antibiotic used to treat various bacterial infections including respiratory tract infections, urinary tract infections, skin infections.',
+        'dosage': 'Adults: 250-500 mg every 8 hours or 500-875 mg every 12 hours. Complete full course even if feeling better.',
+        'warnings': 'Do not use if allergic to penicillin. May reduce effectiveness of birth control pills.',
+        'side_effects': 'Common: Nausea, vomiting, diarrhea, stomach pain, headache, dizziness.'
+    },
+    'omeprazole': {
+        'generic_name': 'Omeprazole',
+        'brand_name': 'Prilosec, Losec',
+        'manufacturer': 'Various',
+        'indications': 'Proton pump inhibitor used to treat GERD, stomach ulcers, duodenal ulcers. Reduces stomach acid production.',
+        'dosage': 'Adults: 20-40 mg once daily before breakfast. Take 30-60 minutes before eating.',
+        'warnings': 'Long-term use may increase risk of bone fractures, vitamin B12 deficiency, and kidney problems.',
+        'side_effects': 'Common: Headache, diarrhea, nausea, vomiting, stomach pain, gas, dizziness.'
+    },
+    'cytarabine': {
+        'generic_name': 'Cytarabine',
+        'brand_name': 'Cytosar-U, Tarabine PFS, Ara-C',
+        'manufacturer': 'Various',
+        'indications': 'Antineoplastic agent used to treat acute lymphocytic leukemia, acute myelogenous leukemia, chronic myelogenous leukemia, and certain lymphomas. Works by interfering with DNA synthesis in cancer cells.',
+        'dosage': 'Dosage varies greatly depending on the specific condition being treated, patient factors, and treatment protocol. Typically given as intravenous infusion. Common regimens range from 100-200 mg/m² daily for 5-10 days. Must be administered by qualified healthcare professionals only.',
+        'warnings': 'Severe myelosuppression (bone marrow suppression), cytarabine syndrome, neurotoxicity at high doses, hepatotoxicity. Requires close monitoring of blood counts, liver function, and neurological status. Only for use under strict medical supervision in specialized cancer treatment facilities.',
+        'side_effects': 'Common: Severe nausea and vomiting, diarrhea, mouth sores, fever, bone marrow suppression leading to increased infection risk, bleeding, and anemia. Serious: Liver toxicity, lung problems, neurological effects (especially at high doses), severe infections due to immunosuppression.'
     }
-    
-    drug_name_lower = drug_name.lower().strip()
-    
+}
+
+# Common misspellings and alternative names
+DRUG_ALIASES = {
+    'paracitamol': 'paracetamol',
+    'paracitemol': 'paracetamol',
+    'tylenol': 'acetaminophen',
+    'panadol': 'paracetamol',
+    'advil': 'ibuprofen',
+    'motrin': 'ibuprofen',
+    'glucophage': 'metformin',
+    'prinivil': 'lisinopril',
+    'zestril': 'lisinopril',
+    'cytosar': 'cytarabine',
+    'ara-c': 'cytarabine',
+    'cytosar-u': 'cytarabine',
+    'tarabine': 'cytarabine'
+}
+
+# All candidate names for fuzzy matching, fixed at import time. The
+# BK-tree prunes candidates by the triangle inequality, so lookup cost
+# stays near-constant as the catalog grows instead of scanning every name.
+_ALL_DRUG_NAMES = tuple(LOCAL_DRUGS.keys()) + tuple(DRUG_ALIASES.keys())
+_DRUG_BKTREE = pybktree.BKTree(Levenshtein.distance, _ALL_DRUG_NAMES)
+
+@lru_cache(maxsize=2048)
+def _drug_lookup(drug_name_lower):
+    """Resolve a normalized drug name to its info dict (cached)."""
     # Check direct match first
-    if drug_name_lower in local_drugs:
-        return local_drugs[drug_name_lower]
+    if drug_name_lower in LOCAL_DRUGS:
+        return LOCAL_DRUGS[drug_name_lower]
     
     # Check aliases for common misspellings
-    if drug_name_lower in drug_aliases:
-        corrected_name = drug_aliases[drug_name_lower]
-        if corrected_name in local_drugs:
-            result = local_drugs[corrected_name].copy()
-            result['_corrected_from'] = drug_name
+    if drug_name_lower in DRUG_ALIASES:
+        corrected_name = DRUG_ALIASES[drug_name_lower]
+        if corrected_name in LOCAL_DRUGS:
+            result = LOCAL_DRUGS[corrected_name].copy()
             result['_corrected_to'] = corrected_name
             return result
     
-    # Use fuzzy matching for close spellings
-    drug_names = list(local_drugs.keys()) + list(drug_aliases.keys())
-    close_matches = difflib.get_close_matches(drug_name_lower, drug_names, n=1, cutoff=0.6)
-    
-    if close_matches:
-        match = close_matches[0]
-        if match in local_drugs:
-            result = local_drugs[match].copy()
-            result['_corrected_from'] = drug_name
+    # Use fuzzy matching for close spellings (edit distance <= 2)
+    hits = _DRUG_BKTREE.find(drug_name_lower, 2)
+
+    if hits:
+        match = hits[0][1]
+        if match in LOCAL_DRUGS:
+            result = LOCAL_DRUGS[match].copy()
             result['_corrected_to'] = match
             return result
-        elif match in drug_aliases:
-            corrected_name = drug_aliases[match]
-            if corrected_name in local_drugs:
-                result = local_drugs[corrected_name].copy()
-                result['_corrected_from'] = drug_name
+        elif match in DRUG_ALIASES:
+            corrected_name = DRUG_ALIASES[match]
+            if corrected_name in LOCAL_DRUGS:
+                result = LOCAL_DRUGS[corrected_name].copy()
                 result['_corrected_to'] = corrected_name
                 return result
     
     return None
 
-def search_openfda_exact(drug_name):
+def get_local_drug_info_with_fuzzy_search(drug_name):
+    """Get drug information with fuzzy matching for common misspellings."""
+    result = _drug_lookup(drug_name.lower().strip())
+    if result is None:
+        return None
+    
+    # Copy so callers can annotate/mutate without touching the cache
+    result = result.copy()
+    if '_corrected_to' in result:
+        result['_corrected_from'] = drug_name
+    return result
+
+# OpenFDA results are persisted in the drug_info_cache table so repeat
+# queries for the same drug hit MySQL instead of the network
+_DRUG_CACHE_MAX_AGE_DAYS = 30
+
+def get_cached_drug_info(drug_name):
+    """Look up a previously fetched OpenFDA record in drug_info_cache."""
+    connection = get_db_connection()
+    if not connection:
+        return None
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT generic_name, brand_name, manufacturer, indications,
+                   dosage, warnings, side_effects
+            FROM drug_info_cache
+            WHERE LOWER(generic_name) = LOWER(%s)
+              AND last_updated >= NOW() - INTERVAL %s DAY
+        """, (drug_name, _DRUG_CACHE_MAX_AGE_DAYS))
+        row = cursor.fetchone()
+        if row:
+            return {
+                'generic_name': row[0],
+                'brand_name': row[1],
+                'manufacturer': row[2],
+                'indications': row[3],
+                'dosage': row[4],
+                'warnings': row[5],
+                'side_effects': row[6]
+            }
+    except mysql.connector.Error as err:
+        print(f"Error reading drug cache: {err}")
+    finally:
+        cursor.close()
+        connection.close()
+
+    return None
+
+def cache_drug_info(drug_info):
+    """Upsert a parsed OpenFDA record into drug_info_cache."""
+    connection = get_db_connection()
+    if not connection:
+        return
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            INSERT INTO drug_info_cache (generic_name, brand_name, manufacturer,
+                                         indications, dosage, warnings, side_effects)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                brand_name = VALUES(brand_name),
+                manufacturer = VALUES(manufacturer),
+                indications = VALUES(indications),
+                dosage = VALUES(dosage),
+                warnings = VALUES(warnings),
+                side_effects = VALUES(side_effects)
+        """, (
+            drug_info['generic_name'], drug_info['brand_name'],
+            drug_info['manufacturer'], drug_info['indications'],
+            drug_info['dosage'], drug_info['warnings'],
+            drug_info['side_effects']
+        ))
+        connection.commit()
+    except mysql.connector.Error as err:
+        print(f"Error writing drug cache: {err}")
+    finally:
+        cursor.close()
+        connection.close()
+
+# Shared HTTP session so the TLS connection to api.fda.gov is kept
+# alive across lookups instead of a fresh handshake per call
+_FDA_SESSION = requests.Session()
+_FDA_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
+# Distinguishes a transient OpenFDA failure (timeout, 5xx) from a
+# genuine "no results" so only the latter is cached as a negative
+_FDA_ERROR = object()
+
+def _search_openfda_exact_uncached(drug_name):
     """Search OpenFDA with exact generic name match."""
+    cached = get_cached_drug_info(drug_name)
+    if cached:
+        return cached
+
     try:
         url = f"https://api.fda.gov/drug/label.json?search=openfda.generic_name.exact:\"{drug_name}\"&limit=1"
-        response = requests.get(url, timeout=10)
-        
+        response = _FDA_SESSION.get(url, timeout=10)
+
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get('results'):
-                return parse_fda_result(data['results'][0])
+                drug_info = parse_fda_result(data['results'][0])
+                if drug_info:
+                    cache_drug_info(drug_info)
+                return drug_info
+        elif response.status_code != 404:
+            # OpenFDA answers a no-match search with 404; anything else
+            # non-200 is a failure, not a negative
+            return _FDA_ERROR
     except Exception as e:
         print(f"OpenFDA exact search error: {e}")
-    
+        return _FDA_ERROR
+
     return None
 
-def search_openfda_broad(drug_name):
+def _search_openfda_broad_uncached(drug_name):
     """Search OpenFDA with broader search terms."""
-    try:
-        url = f"https://api.fda.gov/drug/label.json?search=openfda.generic_name:{drug_name}&limit=1"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('results'):
-                return parse_fda_result(data['results'][0])
-        
-        # Try searching in brand names too
-        url = f"https://api.fda.gov/drug/label.json?search=openfda.brand_name:{drug_name}&limit=1"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('results'):
-                return parse_fda_result(data['results'][0])
-                
-    except Exception as e:
-        print(f"OpenFDA broad search error: {e}")
-    
+    cached = get_cached_drug_info(drug_name)
+    if cached:
+        return cached
+
+    url_generic = f"https://api.fda.gov/drug/label.json?search=openfda.generic_name:{drug_name}&limit=1"
+    url_brand = f"https://api.fda.gov/drug/label.json?search=openfda.brand_name:{drug_name}&limit=1"
+
+    def _fetch(url):
+        try:
+            response = _FDA_SESSION.get(url, timeout=10)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                if data.get('results'):
+                    return parse_fda_result(data['results'][0])
+            elif response.status_code != 404:
+                return _FDA_ERROR
+        except Exception as e:
+            print(f"OpenFDA broad search error: {e}")
+            return _FDA_ERROR
+        return None
+
+    # Fire the generic-name and brand-name queries concurrently so total
+    # latency is the max of the two round-trips, not the sum. The
+    # generic-name hit still wins when both match.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        generic_future = executor.submit(_fetch, url_generic)
+        brand_future = executor.submit(_fetch, url_brand)
+        results = (generic_future.result(), brand_future.result())
+
+    for drug_info in results:
+        if drug_info is not None and drug_info is not _FDA_ERROR:
+            cache_drug_info(drug_info)
+            return drug_info
+    if _FDA_ERROR in results:
+        return _FDA_ERROR
     return None
 
+# In-process TTL cache in front of the OpenFDA helpers. Drug queries
+# are heavy-tailed, so hits skip both the network and the MySQL cache;
+# misses are cached too so unknown names don't hammer the API.
+_FDA_TTL_CACHE = TTLCache(maxsize=2048, ttl=86400)
+_FDA_TTL_LOCK = threading.Lock()
+_FDA_MISS = object()
+
+def _fda_cached(kind, drug_name, fetch):
+    """Memoize an OpenFDA lookup (positive or negative) for the TTL."""
+    key = (kind, drug_name.lower())
+    with _FDA_TTL_LOCK:
+        cached = _FDA_TTL_CACHE.get(key)
+    if cached is not None:
+        return None if cached is _FDA_MISS else dict(cached)
+
+    result = fetch(drug_name)
+    if result is _FDA_ERROR:
+        # Transient failure - answer this request with nothing but leave
+        # the cache alone so the next query retries the API
+        return None
+    with _FDA_TTL_LOCK:
+        # Cache a copy: callers (translation) mutate the returned dict
+        _FDA_TTL_CACHE[key] = _FDA_MISS if result is None else dict(result)
+    return result
+
+def search_openfda_exact(drug_name):
+    return _fda_cached('exact', drug_name, _search_openfda_exact_uncached)
+
+def search_openfda_broad(drug_name):
+    return _fda_cached('broad', drug_name, _search_openfda_broad_uncached)
+
+# Extraction tables for parse_fda_result: (output key, source key, default).
+# The openfda sub-dict is fetched once instead of per field.
+_OPENFDA_FIELDS = (
+    ('generic_name', 'generic_name', 'Unknown'),
+    ('brand_name', 'brand_name', 'N/A'),
+    ('manufacturer', 'manufacturer_name', 'N/A')
+)
+_LABEL_FIELDS = (
+    ('indications', 'indications_and_usage', 'No information available'),
+    ('dosage', 'dosage_and_administration', 'No information available'),
+    ('warnings', 'warnings', 'No warnings listed'),
+    ('side_effects', 'adverse_reactions', 'No side effects listed')
+)
+
 def parse_fda_result(result):
     """Parse FDA API result into standardized format."""
     try:
-        return {
-            'generic_name': result.get('openfda', {}).get('generic_name', ['Unknown'])[0],
-            'brand_name': result.get('openfda', {}).get('brand_name', ['N/A'])[0] if result.get('openfda', {}).get('brand_name') else 'N/A',
-            'manufacturer': result.get('openfda', {}).get('manufacturer_name', ['N/A'])[0] if result.get('openfda', {}).get('manufacturer_name') else 'N/A',
-            'indications': result.get('indications_and_usage', ['No information available'])[0] if result.get('indications_and_usage') else 'No information available',
-            'dosage': result.get('dosage_and_administration', ['No information available'])[0] if result.get('dosage_and_administration') else 'No information available',
-            'warnings': result.get('warnings', ['No warnings listed'])[0] if result.get('warnings') else 'No warnings listed',
-            'side_effects': result.get('adverse_reactions', ['No side effects listed'])[0] if result.get('adverse_reactions') else 'No side effects listed'
-        }
+        openfda = result.get('openfda') or {}
+        drug_info = {}
+        for out_key, src_key, default in _OPENFDA_FIELDS:
+            values = openfda.get(src_key)
+            drug_info[out_key] = values[0] if values else default
+        for out_key, src_key, default in _LABEL_FIELDS:
+            values = result.get(src_key)
+            drug_info[out_key] = values[0] if values else default
+        return drug_info
     except Exception as e:
         print(f"Error parsing FDA result: {e}")
         return None
 
+# Results whose generic name matches these are almost always irrelevant
+# hits (topical solutions etc.) - compiled once so validation is a
+# single C-level regex scan
+_SUSPICIOUS_RE = re.compile(r'povidone|iodine|sodium|solution')
+
 def validate_fda_result(drug_info, original_query):
     """Validate that FDA result is relevant to the query."""
     if not drug_info or not drug_info.get('generic_name'):
         return False
     
-    query_lower = original_query.lower()
     generic_name_lower = drug_info['generic_name'].lower()
     
-    # If the names are completely different, it's likely wrong
-    if not any(word in generic_name_lower for word in query_lower.split() if len(word) > 2):
+    # Check if it's a reasonable drug result
+    if _SUSPICIOUS_RE.search(generic_name_lower):
         return False
     
-    # Additional validation: check if it's a reasonable drug result
-    suspicious_names = ['povidone', 'iodine', 'sodium', 'solution']
-    if any(name in generic_name_lower for name in suspicious_names):
+    # If the names are completely different, it's likely wrong
+    tokens = [word for word in original_query.lower().split() if len(word) > 2]
+    if not any(token in generic_name_lower for token in tokens):
         return False
     
     return True
@@ -558,14 +969,49 @@ def get_drug_suggestions(drug_name):
     ]
     
     # Check if it's a close match to any available drug
-    close_matches = difflib.get_close_matches(drug_name.lower(), available_drugs, n=3, cutoff=0.4)
-    
+    close_matches = process.extract(drug_name.lower(), available_drugs, scorer=fuzz.ratio, limit=3, score_cutoff=40)
+
     if close_matches:
-        suggestions = ", ".join(close_matches)
+        suggestions = ", ".join(match[0] for match in close_matches)
         return f"Did you mean one of these: {suggestions}?"
     else:
         return f"I have detailed information about these common drugs: {', '.join(available_drugs[:6])}. Try searching for one of these!"
 
+# Constant redirect messages, percent-encoded once at import so the
+# error paths skip re-quoting the same literals per request
+_ERR_FIELDS = quote('Please fill in all fields.')
+_ERR_SHORT_PW = quote('Password must be at least 6 characters long.')
+_ERR_EXISTS = quote('Username or email already exists.')
+_ERR_DB = quote('Database connection failed.')
+_ERR_CREDS_MISSING = quote('Please enter both username and password.')
+_ERR_BAD_LOGIN = quote('Invalid username or password.')
+_MSG_SIGNED_UP = quote('Account created successfully! Please check your email and sign in.')
+_MSG_LOGGED_OUT = quote('You have been logged out successfully.')
+
+# Hot auth SQL - module-level constants so the query strings aren't
+# rebuilt on every request
+_SQL_INSERT_USER = "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)"
+_SQL_LOGIN = "SELECT id, username, password FROM users WHERE username = %s"
+
+# Rendered-page cache for the near-static authenticated pages. Their
+# templates only vary by username, so a short TTL lets repeat hits skip
+# the whole Jinja pass. Pages that show live DB data are never cached.
+_PAGE_CACHE = TTLCache(maxsize=1024, ttl=30)
+_PAGE_CACHE_LOCK = threading.Lock()
+_CACHED_PAGES = ('dashboard.html', 'appointment.html',
+                 'health_records.html', 'drug_chat.html')
+
+def _render_cached(template):
+    """Render a static authenticated page, reusing cached HTML per user."""
+    key = (template, session['user_id'])
+    with _PAGE_CACHE_LOCK:
+        html = _PAGE_CACHE.get(key)
+    if html is None:
+        html = render_template(template)
+        with _PAGE_CACHE_LOCK:
+            _PAGE_CACHE[key] = html
+    return html
+
 # Basic Routes
 @app.route('/')
 def index():
@@ -578,44 +1024,42 @@ def signup():
     password = request.form.get('password')
     
     if not username or not email or not password:
-        error_msg = quote("Please fill in all fields.")
-        return redirect(f'/?error={error_msg}')
+        return redirect(f'/?error={_ERR_FIELDS}')
     
     if len(password) < 6:
-        error_msg = quote("Password must be at least 6 characters long.")
-        return redirect(f'/?error={error_msg}')
+        return redirect(f'/?error={_ERR_SHORT_PW}')
     
-    hashed_password = generate_password_hash(password)
+    hashed_password = hash_password(password)
     
-    connection = get_db_connection()
+    connection = get_request_db()
     if not connection:
-        error_msg = quote("Database connection failed.")
-        return redirect(f'/?error={error_msg}')
+        return redirect(f'/?error={_ERR_DB}')
     
     try:
         cursor = connection.cursor()
-        
-        cursor.execute("SELECT id FROM users WHERE username = %s OR email = %s", (username, email))
-        if cursor.fetchone():
-            error_msg = quote("Username or email already exists.")
-            return redirect(f'/?error={error_msg}')
-        
-        insert_query = "INSERT INTO users (username, email, password) VALUES (%s, %s, %s)"
-        cursor.execute(insert_query, (username, email, hashed_password))
+
+        # The unique indexes on username/email catch duplicates, so no
+        # pre-check SELECT is needed - one round-trip instead of two
+        cursor.execute(_SQL_INSERT_USER, (username, email, hashed_password))
         connection.commit()
-        
-        send_welcome_email(username, email)
-        
-        success_msg = quote("Account created successfully! Please check your email and sign in.")
-        return redirect(f'/?success={success_msg}')
-        
+
+        send_welcome_email_async(username, email)
+
+        return redirect(f'/?success={_MSG_SIGNED_UP}')
+
+    except mysql.connector.errors.IntegrityError as err:
+        if err.errno == 1062:
+            error_msg = _ERR_EXISTS
+        else:
+            error_msg = quote(f"Registration failed: {str(err)}")
+        return redirect(f'/?error={error_msg}')
+
     except mysql.connector.Error as err:
         error_msg = quote(f"Registration failed: {str(err)}")
         return redirect(f'/?error={error_msg}')
     
     finally:
         cursor.close()
-        connection.close()
 
 @app.route('/login', methods=['POST'])
 def login():
@@ -623,26 +1067,24 @@ def login():
     password = request.form.get('password')
     
     if not username or not password:
-        error_msg = quote("Please enter both username and password.")
-        return redirect(f'/?error={error_msg}')
+        return redirect(f'/?error={_ERR_CREDS_MISSING}')
     
-    connection = get_db_connection()
+    connection = get_request_db()
     if not connection:
-        error_msg = quote("Database connection failed.")
-        return redirect(f'/?error={error_msg}')
+        return redirect(f'/?error={_ERR_DB}')
     
     try:
         cursor = connection.cursor()
-        cursor.execute("SELECT id, username, password FROM users WHERE username = %s", (username,))
+        cursor.execute(_SQL_LOGIN, (username,))
         user = cursor.fetchone()
-        
-        if user and check_password_hash(user[2], password):
+
+        stored_hash = user[2] if user else _DUMMY_HASH
+        if verify_password(stored_hash, password) and user:
             session['user_id'] = user[0]
             session['username'] = user[1]
             return redirect('/dashboard')
         else:
-            error_msg = quote("Invalid username or password.")
-            return redirect(f'/?error={error_msg}')
+            return redirect(f'/?error={_ERR_BAD_LOGIN}')
             
     except mysql.connector.Error as err:
         error_msg = quote(f"Login failed: {str(err)}")
@@ -650,26 +1092,28 @@ def login():
     
     finally:
         cursor.close()
-        connection.close()
 
 @app.route('/dashboard')
 def dashboard():
     if 'user_id' not in session:
         return redirect('/')
-    return render_template('dashboard.html', username=session.get('username', 'User'))
+    return _render_cached('dashboard.html')
 
 @app.route('/logout', methods=['POST'])
 def logout():
+    user_id = session.get('user_id')
+    with _PAGE_CACHE_LOCK:
+        for template in _CACHED_PAGES:
+            _PAGE_CACHE.pop((template, user_id), None)
     session.clear()
-    success_msg = quote("You have been logged out successfully.")
-    return redirect(f'/?success={success_msg}')
+    return redirect(f'/?success={_MSG_LOGGED_OUT}')
 
 # Appointment Routes
 @app.route('/appointment')
 def appointment():
     if 'user_id' not in session:
         return redirect('/')
-    return render_template('appointment.html', username=session.get('username', 'User'))
+    return _render_cached('appointment.html')
 
 @app.route('/book-appointment', methods=['POST'])
 def book_appointment():
@@ -690,76 +1134,103 @@ def book_appointment():
         'insurance': request.form.get('insurance')
     }
     
-    connection = get_db_connection()
-    if not connection:
-        return redirect('/appointment?error=Database connection failed')
-    
     try:
-        cursor = connection.cursor()
-        
-        insert_query = """
-        INSERT INTO appointments (user_id, patient_name, patient_email, patient_phone, 
-                                specialty, doctor, appointment_date, appointment_time, 
-                                appointment_type, symptoms, insurance)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
+        with db_cursor() as (connection, cursor):
+            if connection is None:
+                return redirect('/appointment?error=Database connection failed')
+            
+            insert_query = """
+            INSERT INTO appointments (user_id, patient_name, patient_email, patient_phone, 
+                                    specialty, doctor, appointment_date, appointment_time, 
+                                    appointment_type, symptoms, insurance)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            
+            cursor.execute(insert_query, (
+                appointment_data['user_id'], appointment_data['patient_name'],
+                appointment_data['patient_email'], appointment_data['patient_phone'],
+                appointment_data['specialty'], appointment_data['doctor'],
+                appointment_data['appointment_date'], appointment_data['appointment_time'],
+                appointment_data['appointment_type'], appointment_data['symptoms'],
+                appointment_data['insurance']
+            ))
+            
+            connection.commit()
         
-        cursor.execute(insert_query, (
-            appointment_data['user_id'], appointment_data['patient_name'],
-            appointment_data['patient_email'], appointment_data['patient_phone'],
-            appointment_data['specialty'], appointment_data['doctor'],
-            appointment_data['appointment_date'], appointment_data['appointment_time'],
-            appointment_data['appointment_type'], appointment_data['symptoms'],
-            appointment_data['insurance']
-        ))
-        
-        connection.commit()
-        send_appointment_confirmation(appointment_data)
+        send_appointment_confirmation_async(appointment_data)
         
         return redirect('/appointment?success=Appointment booked successfully!')
         
     except mysql.connector.Error as err:
         return redirect(f'/appointment?error=Booking failed: {str(err)}')
-    
-    finally:
-        cursor.close()
+
+def _stream_rows(query, params, batch_size=200):
+    """Return rows for a streamed response without buffering them all.
+
+    Returns [] when the query matches nothing, so the templates'
+    `{% if records %}` empty-state branches still work (a bare generator
+    is always truthy). Otherwise returns a generator that yields the
+    already-fetched first batch and streams the rest, releasing the
+    connection when it is exhausted or closed. Streaming routes can't
+    use db_cursor() because the rows are consumed after the handler
+    returns, so the generator owns the checkout.
+    """
+    connection = get_db_connection()
+    if connection is None:
+        return []
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        cursor.execute(query, params)
+        first = cursor.fetchmany(batch_size)
+    except mysql.connector.Error as err:
+        print(f"Error streaming rows: {err}")
+        first = []
+
+    if not first:
+        if cursor is not None:
+            cursor.close()
         connection.close()
+        return []
+
+    def _rows():
+        batch = first
+        try:
+            while batch:
+                yield from batch
+                batch = cursor.fetchmany(batch_size)
+        finally:
+            cursor.close()
+            connection.close()
+
+    return _rows()
 
 # EHR Routes
 @app.route('/health-records')
 def health_records():
     if 'user_id' not in session:
         return redirect('/')
-    return render_template('health_records.html', username=session.get('username', 'User'))
+    return _render_cached('health_records.html')
 
 @app.route('/medical-records')
 def medical_records():
     if 'user_id' not in session:
         return redirect('/')
     
-    connection = get_db_connection()
-    records = []
-    
-    if connection:
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT id, record_type, title, description, date_recorded, 
-                       healthcare_provider, created_at 
-                FROM medical_records 
-                WHERE user_id = %s 
-                ORDER BY date_recorded DESC
-            """, (session['user_id'],))
-            records = cursor.fetchall()
-        except mysql.connector.Error as err:
-            print(f"Error fetching medical records: {err}")
-        finally:
-            cursor.close()
-            connection.close()
-    
-    return render_template('medical_records.html', 
-                         records=records, 
-                         username=session.get('username', 'User'))
+    # Rows are streamed DB -> template -> socket instead of
+    # materializing the full list and rendered page in memory
+    records = _stream_rows("""
+        SELECT id, record_type, title, description, date_recorded, 
+               healthcare_provider, created_at 
+        FROM medical_records 
+        WHERE user_id = %s 
+        ORDER BY date_recorded DESC
+        LIMIT 200
+    """, (session['user_id'],))
+    
+    return Response(stream_with_context(stream_template(
+        'medical_records.html', records=records)))
 
 @app.route('/add-medical-record', methods=['POST'])
 def add_medical_record():
@@ -775,92 +1246,67 @@ def add_medical_record():
     if not all([record_type, title, date_recorded]):
         return redirect('/medical-records?error=Please fill in required fields')
     
-    connection = get_db_connection()
-    if not connection:
-        return redirect('/medical-records?error=Database connection failed')
-    
     try:
-        cursor = connection.cursor()
-        insert_query = """
-        INSERT INTO medical_records (user_id, record_type, title, description, 
-                                   date_recorded, healthcare_provider)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute(insert_query, (
-            session['user_id'], record_type, title, description,
-            date_recorded, healthcare_provider
-        ))
-        connection.commit()
+        with db_cursor() as (connection, cursor):
+            if connection is None:
+                return redirect('/medical-records?error=Database connection failed')
+            
+            insert_query = """
+            INSERT INTO medical_records (user_id, record_type, title, description, 
+                                       date_recorded, healthcare_provider)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """
+            cursor.execute(insert_query, (
+                session['user_id'], record_type, title, description,
+                date_recorded, healthcare_provider
+            ))
+            connection.commit()
+        
         return redirect('/medical-records?success=Medical record added successfully!')
         
     except mysql.connector.Error as err:
         return redirect(f'/medical-records?error=Failed to add record: {str(err)}')
-    
-    finally:
-        cursor.close()
-        connection.close()
 
 @app.route('/delete-medical-record/<int:record_id>', methods=['POST'])
 def delete_medical_record(record_id):
     if 'user_id' not in session:
         return redirect('/')
     
-    connection = get_db_connection()
-    if not connection:
-        return redirect('/medical-records?error=Database connection failed')
-    
     try:
-        cursor = connection.cursor()
-        
-        cursor.execute("SELECT user_id FROM medical_records WHERE id = %s", (record_id,))
-        record = cursor.fetchone()
-        
-        if not record:
-            return redirect('/medical-records?error=Record not found')
-        
-        if record[0] != session['user_id']:
-            return redirect('/medical-records?error=Unauthorized access')
-        
-        cursor.execute("DELETE FROM medical_records WHERE id = %s", (record_id,))
-        connection.commit()
+        with db_cursor() as (connection, cursor):
+            if connection is None:
+                return redirect('/medical-records?error=Database connection failed')
+            
+            # Ownership is enforced in the WHERE clause, so the check and
+            # the delete are one statement with no TOCTOU window
+            cursor.execute("DELETE FROM medical_records WHERE id = %s AND user_id = %s",
+                           (record_id, session['user_id']))
+            connection.commit()
+            
+            if cursor.rowcount == 0:
+                return redirect('/medical-records?error=Record not found or unauthorized')
         
         return redirect('/medical-records?success=Medical record deleted successfully!')
         
     except mysql.connector.Error as err:
         return redirect(f'/medical-records?error=Failed to delete record: {str(err)}')
-    
-    finally:
-        cursor.close()
-        connection.close()
 
 @app.route('/medications')
 def medications():
     if 'user_id' not in session:
         return redirect('/')
     
-    connection = get_db_connection()
-    medications = []
-    
-    if connection:
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT id, medication_name, dosage, frequency, start_date, 
-                       end_date, prescribing_doctor, is_active, notes
-                FROM medications 
-                WHERE user_id = %s 
-                ORDER BY is_active DESC, start_date DESC
-            """, (session['user_id'],))
-            medications = cursor.fetchall()
-        except mysql.connector.Error as err:
-            print(f"Error fetching medications: {err}")
-        finally:
-            cursor.close()
-            connection.close()
-    
-    return render_template('medications.html', 
-                         medications=medications, 
-                         username=session.get('username', 'User'))
+    medications = _stream_rows("""
+        SELECT id, medication_name, dosage, frequency, start_date, 
+               end_date, prescribing_doctor, is_active, notes
+        FROM medications 
+        WHERE user_id = %s 
+        ORDER BY is_active DESC, start_date DESC
+        LIMIT 200
+    """, (session['user_id'],))
+    
+    return Response(stream_with_context(stream_template(
+        'medications.html', medications=medications)))
 
 @app.route('/add-medication', methods=['POST'])
 def add_medication():
@@ -878,60 +1324,44 @@ def add_medication():
     if not all([medication_name, dosage, frequency, start_date]):
         return redirect('/medications?error=Please fill in required fields')
     
-    connection = get_db_connection()
-    if not connection:
-        return redirect('/medications?error=Database connection failed')
-    
     try:
-        cursor = connection.cursor()
-        insert_query = """
-        INSERT INTO medications (user_id, medication_name, dosage, frequency, 
-                               start_date, end_date, prescribing_doctor, notes)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute(insert_query, (
-            session['user_id'], medication_name, dosage, frequency,
-            start_date, end_date or None, prescribing_doctor, notes
-        ))
-        connection.commit()
+        with db_cursor() as (connection, cursor):
+            if connection is None:
+                return redirect('/medications?error=Database connection failed')
+            
+            insert_query = """
+            INSERT INTO medications (user_id, medication_name, dosage, frequency, 
+                                   start_date, end_date, prescribing_doctor, notes)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            cursor.execute(insert_query, (
+                session['user_id'], medication_name, dosage, frequency,
+                start_date, end_date or None, prescribing_doctor, notes
+            ))
+            connection.commit()
+        
         return redirect('/medications?success=Medication added successfully!')
         
     except mysql.connector.Error as err:
         return redirect(f'/medications?error=Failed to add medication: {str(err)}')
-    
-    finally:
-        cursor.close()
-        connection.close()
 
 @app.route('/vital-signs')
 def vital_signs():
     if 'user_id' not in session:
         return redirect('/')
     
-    connection = get_db_connection()
-    vitals = []
-    
-    if connection:
-        try:
-            cursor = connection.cursor()
-            cursor.execute("""
-                SELECT id, measurement_date, blood_pressure_systolic, 
-                       blood_pressure_diastolic, heart_rate, temperature, 
-                       weight, height, notes
-                FROM vital_signs 
-                WHERE user_id = %s 
-                ORDER BY measurement_date DESC
-            """, (session['user_id'],))
-            vitals = cursor.fetchall()
-        except mysql.connector.Error as err:
-            print(f"Error fetching vital signs: {err}")
-        finally:
-            cursor.close()
-            connection.close()
-    
-    return render_template('vital_signs.html', 
-                         vitals=vitals, 
-                         username=session.get('username', 'User'))
+    vitals = _stream_rows("""
+        SELECT id, measurement_date, blood_pressure_systolic, 
+               blood_pressure_diastolic, heart_rate, temperature, 
+               weight, height, notes
+        FROM vital_signs 
+        WHERE user_id = %s 
+        ORDER BY measurement_date DESC
+        LIMIT 200
+    """, (session['user_id'],))
+    
+    return Response(stream_with_context(stream_template(
+        'vital_signs.html', vitals=vitals)))
 
 @app.route('/add-vital-signs', methods=['POST'])
 def add_vital_signs():
@@ -950,124 +1380,49 @@ def add_vital_signs():
     if not measurement_date:
         return redirect('/vital-signs?error=Please select a measurement date')
     
-    connection = get_db_connection()
-    if not connection:
-        return redirect('/vital-signs?error=Database connection failed')
-    
     try:
-        cursor = connection.cursor()
-        insert_query = """
-        INSERT INTO vital_signs (user_id, measurement_date, blood_pressure_systolic,
-                               blood_pressure_diastolic, heart_rate, temperature,
-                               weight, height, notes)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute(insert_query, (
-            session['user_id'], measurement_date, 
-            systolic or None, diastolic or None, heart_rate or None,
-            temperature or None, weight or None, height or None, notes
-        ))
-        connection.commit()
+        with db_cursor() as (connection, cursor):
+            if connection is None:
+                return redirect('/vital-signs?error=Database connection failed')
+            
+            insert_query = """
+            INSERT INTO vital_signs (user_id, measurement_date, blood_pressure_systolic,
+                                   blood_pressure_diastolic, heart_rate, temperature,
+                                   weight, height, notes)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            cursor.execute(insert_query, (
+                session['user_id'], measurement_date, 
+                systolic or None, diastolic or None, heart_rate or None,
+                temperature or None, weight or None, height or None, notes
+            ))
+            connection.commit()
+        
         return redirect('/vital-signs?success=Vital signs added successfully!')
         
     except mysql.connector.Error as err:
         return redirect(f'/vital-signs?error=Failed to add vital signs: {str(err)}')
-    
-    finally:
-        cursor.close()
-        connection.close()
 
 # Drug Information Chatbot Routes
 @app.route('/drug-info-chat')
 def drug_info_chat():
     if 'user_id' not in session:
         return redirect('/')
-    return render_template('drug_chat.html', username=session.get('username', 'User'))
-
-# SINGLE drug info route - this replaces both previous versions
-@app.route('/get-drug-info', methods=['POST'])
-def get_drug_info():
-    """Get drug information with improved spelling correction and validation."""
-    if 'user_id' not in session:
-        return jsonify({'error': 'Not authenticated'}), 401
-    
-    data = request.get_json()
-    drug_name = data.get('drug_name', '').strip()
-    
-    if not drug_name:
-        return jsonify({'error': 'Please enter a drug name'}), 400
-    
-    # Method 1: Try local database with fuzzy matching first
-    try:
-        drug_info = get_local_drug_info_with_fuzzy_search(drug_name)
-        if drug_info:
-            message = f"Here's information about {drug_info['generic_name']}:"
-            
-            # Add correction message if spelling was corrected
-            if '_corrected_from' in drug_info:
-                message = f"Did you mean '{drug_info['_corrected_to']}'? Here's information about {drug_info['generic_name']}:"
-                # Remove correction metadata before sending
-                del drug_info['_corrected_from']
-                del drug_info['_corrected_to']
-            
-            return jsonify({
-                'success': True,
-                'drug_info': drug_info,
-                'message': message,
-                'source': 'local'
-            })
-    except Exception as e:
-        print(f"Local database search failed: {e}")
-    
-    # Method 2: Try OpenFDA API only if local search fails
-    if len(drug_name) < 3:
-        return jsonify({
-            'success': False,
-            'message': "Please enter a complete drug name (at least 3 characters)."
-        })
-    
-    try:
-        # Try OpenFDA with better validation
-        drug_info = search_openfda_exact(drug_name)
-        if drug_info and validate_fda_result(drug_info, drug_name):
-            return jsonify({
-                'success': True,
-                'drug_info': drug_info,
-                'message': f"Here's information about {drug_info['generic_name']}:",
-                'source': 'fda'
-            })
-    except Exception as e:
-        print(f"OpenFDA search failed: {e}")
-    
-    # Method 3: Try broader FDA search
-    try:
-        drug_info = search_openfda_broad(drug_name)
-        if drug_info and validate_fda_result(drug_info, drug_name):
-            return jsonify({
-                'success': True,
-                'drug_info': drug_info,
-                'message': f"Here's information about {drug_info['generic_name']}:",
-                'source': 'fda'
-            })
-    except Exception as e:
-        print(f"OpenFDA broad search failed: {e}")
-    
-    # Provide helpful suggestions
-    suggestions = get_drug_suggestions(drug_name)
-    return jsonify({
-        'success': False,
-        'message': f"Sorry, I couldn't find information about '{drug_name}'. {suggestions}"
-    })
-# Add these imports at the top of your existing app.py
-import openai
-from google.cloud import translate_v2 as translate
-import base64
-import tempfile
+    return _render_cached('drug_chat.html')
 
-# Add this class after your existing functions (around line 300)
 class MultiLanguageService:
+    _CACHE_MAX = 4096
+
+    # Fallback Hindi -> English dictionary with a precompiled alternation
+    # so substitution is one scan of the text, not one str.replace per entry
+    _HI_EN = {'दवा': 'medicine', 'बुखार': 'fever'}
+    _HI_PAT = re.compile('|'.join(re.escape(word) for word in _HI_EN))
+
     def __init__(self):
         self.translate_client = None
+        # Memo of (text, source, target) -> translation so static strings
+        # like the response messages are only ever translated once
+        self._cache = {}
         try:
             if os.getenv('GOOGLE_APPLICATION_CREDENTIALS'):
                 self.translate_client = translate.Client()
@@ -1078,6 +1433,41 @@ class MultiLanguageService:
         if source_lang == target_lang:
             return text
         
+        key = (text, source_lang, target_lang)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._translate_uncached(text, source_lang, target_lang)
+        if len(self._cache) < self._CACHE_MAX:
+            self._cache[key] = result
+        return result
+    
+    def translate_many(self, texts, source_lang, target_lang):
+        """Translate several strings in one API round-trip.
+
+        The Google API accepts a list, so uncached strings are batched
+        into a single call instead of one HTTPS round-trip each.
+        """
+        if source_lang == target_lang:
+            return list(texts)
+        
+        missing = [text for text in texts
+                   if (text, source_lang, target_lang) not in self._cache]
+        if missing and self.translate_client:
+            try:
+                results = self.translate_client.translate(
+                    missing, source_language=source_lang, target_language=target_lang
+                )
+                for text, result in zip(missing, results):
+                    if len(self._cache) < self._CACHE_MAX:
+                        self._cache[(text, source_lang, target_lang)] = result['translatedText']
+            except:
+                pass
+        
+        return [self.translate_text(text, source_lang, target_lang) for text in texts]
+    
+    def _translate_uncached(self, text, source_lang, target_lang):
         if self.translate_client:
             try:
                 result = self.translate_client.translate(
@@ -1089,18 +1479,37 @@ class MultiLanguageService:
         
         # Simple fallback dictionary
         if source_lang == 'hi' and target_lang == 'en':
-            hindi_to_eng = {'दवा': 'medicine', 'बुखार': 'fever'}
-            for hindi, eng in hindi_to_eng.items():
-                text = text.replace(hindi, eng)
-        
+            text = self._HI_PAT.sub(lambda m: self._HI_EN[m.group(0)], text)
+
         return text
 
 # Initialize service
 ml_service = MultiLanguageService()
 
-# Replace your existing /get-drug-info route with this enhanced version
+def _drug_info_response(drug_info, message, source, user_language):
+    """Build the JSON success response, translating fields if needed."""
+    if user_language != 'en':
+        # One batched call for all user-facing fields
+        indications, side_effects, message = ml_service.translate_many(
+            [drug_info.get('indications') or '', drug_info.get('side_effects') or '', message],
+            'en', user_language
+        )
+        if drug_info.get('indications'):
+            drug_info['indications'] = indications
+        if drug_info.get('side_effects'):
+            drug_info['side_effects'] = side_effects
+    
+    return jsonify({
+        'success': True,
+        'drug_info': drug_info,
+        'message': message,
+        'source': source
+    })
+
 @app.route('/get-drug-info', methods=['POST'])
 def get_drug_info():
+    """Get drug information with spelling correction, multi-language
+    support, and a local -> OpenFDA lookup fallback."""
     if 'user_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
@@ -1115,32 +1524,55 @@ def get_drug_info():
     if user_language != 'en':
         drug_name = ml_service.translate_text(drug_name, user_language, 'en')
     
-    # Your existing drug search logic
-    drug_info = get_local_drug_info_with_fuzzy_search(drug_name)
-    if drug_info:
-        # Translate response back to user language
-        if user_language != 'en':
-            if drug_info.get('indications'):
-                drug_info['indications'] = ml_service.translate_text(drug_info['indications'], 'en', user_language)
-            if drug_info.get('side_effects'):
-                drug_info['side_effects'] = ml_service.translate_text(drug_info['side_effects'], 'en', user_language)
-        
-        message = f"Here's information about {drug_info['generic_name']}:"
-        if user_language != 'en':
-            message = ml_service.translate_text(message, 'en', user_language)
-        
+    # Tier 1: local database with fuzzy matching - a dict probe, so no
+    # point speculating the FDA calls before it answers
+    try:
+        drug_info = get_local_drug_info_with_fuzzy_search(drug_name)
+        if drug_info:
+            message = f"Here's information about {drug_info['generic_name']}:"
+            
+            # Add correction message if spelling was corrected
+            if '_corrected_from' in drug_info:
+                message = f"Did you mean '{drug_info['_corrected_to']}'? Here's information about {drug_info['generic_name']}:"
+                # Remove correction metadata before sending
+                del drug_info['_corrected_from']
+                del drug_info['_corrected_to']
+            
+            return _drug_info_response(drug_info, message, 'local', user_language)
+    except Exception as e:
+        print(f"Local database search failed: {e}")
+    
+    # Tiers 2+3: OpenFDA, only when the local database misses
+    if len(drug_name) < 3:
         return jsonify({
-            'success': True,
-            'drug_info': drug_info,
-            'message': message,
-            'source': 'local'
+            'success': False,
+            'message': "Please enter a complete drug name (at least 3 characters)."
         })
     
-    # Your existing fallback logic
+    # The exact and broad searches are independent round-trips, so fire
+    # them together and take the exact hit when both come back
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            exact_future = executor.submit(search_openfda_exact, drug_name)
+            broad_future = executor.submit(search_openfda_broad, drug_name)
+            
+            for future in (exact_future, broad_future):
+                drug_info = future.result()
+                if drug_info and validate_fda_result(drug_info, drug_name):
+                    message = f"Here's information about {drug_info['generic_name']}:"
+                    return _drug_info_response(drug_info, message, 'fda', user_language)
+    except Exception as e:
+        print(f"OpenFDA search failed: {e}")
+    
+    # Provide helpful suggestions
     suggestions = get_drug_suggestions(drug_name)
+    message = f"Sorry, I couldn't find information about '{drug_name}'. {suggestions}"
+    if user_language != 'en':
+        message = ml_service.translate_text(message, 'en', user_language)
+    
     return jsonify({
         'success': False,
-        'message': f"Sorry, I couldn't find information about '{drug_name}'. {suggestions}"
+        'message': message
     })
 
 if __name__ == '__main__':